@@ -5,268 +5,492 @@
 
 import re
 import json
+import functools
+import itertools
+import operator
+import contextlib
+import hashlib
+import mmap
 import os
+import pickle
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import traceback
 
+try:
+    import orjson
+except ImportError:  # opcional: sem orjson, usa o json da stdlib
+    orjson = None
+
+# Padrões compilados uma vez só (reaproveitados em todas as chamadas).
+# Os padrões rb'' varrem o arquivo mapeado (bytes); os r'' atuam no array já decodificado.
+# Únicos caracteres que mudam o estado da varredura de colchetes
+_BRACKET_SCAN_RE = re.compile(rb'[\[\]{}"\'\\]')
+# Classe de cada byte na varredura (0 = irrelevante) e o fechamento esperado de cada abertura
+_QUOTE_BYTE, _BACKSLASH_BYTE, _OPEN_BYTE, _CLOSE_BYTE = 1, 2, 3, 4
+_BACKSLASH = ord('\\')
+_BYTE_CLASS = bytearray(256)
+for _b in b'"\'':
+    _BYTE_CLASS[_b] = _QUOTE_BYTE
+_BYTE_CLASS[_BACKSLASH] = _BACKSLASH_BYTE
+for _b in b'[{':
+    _BYTE_CLASS[_b] = _OPEN_BYTE
+for _b in b']}':
+    _BYTE_CLASS[_b] = _CLOSE_BYTE
+_CLOSER = bytearray(256)
+_CLOSER[ord('[')] = ord(']')
+_CLOSER[ord('{')] = ord('}')
+del _b
+# Trechos sem comentário (grupo 1) são preservados em blocos: texto comum, strings inteiras e
+# '/' que não abre comentário; comentários // e /* */ casam fora do grupo e somem.
+# Strings/comentários sem fechamento vão até o fim do texto, como na varredura anterior.
+# Os laços são "desenrolados" ([^"\\]* etc.): trechos sem delimitador são consumidos de uma vez.
+_JS_STRING_OR_COMMENT_RE = re.compile(
+    r'''((?:[^"'/]+|"[^"\\]*(?:\\[\s\S]?[^"\\]*)*"?|'[^'\\]*(?:\\[\s\S]?[^'\\]*)*'?|/(?![/*]))+)'''
+    r'|//[^\r\n]*'
+    r'|/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\**\Z)'
+)
+# Tokens de literal JS; o grupo que casou (m.lastindex) escolhe o tratamento em _JS_TOKEN_HANDLERS.
+# O grupo 1 junta num bloco só tudo que já é JSON válido, e strings com aspas duplas entram
+# inteiras nele para que nada dentro delas seja reescrito.
+_JS_LITERAL_TOKEN_RE = re.compile(
+    r'((?:[^"\',A-Za-z_$]+'                         # 1: trecho mantido: texto comum,
+    r'|"[^"\\]*(?:\\[\s\S][^"\\]*)*"'               #    strings com aspas duplas,
+    r'|,(?!\s*[\]}])'                               #    vírgulas que não são finais
+    r'|(?<![\w$])[A-Za-z_$][\w$]*(?![\w$]|\s*:)'    #    e palavras que não são chave (true, null...)
+    r')+)'
+    r"|'([^'\\]*(?:\\[\s\S][^'\\]*)*)'"             # 2: string com aspas simples
+    r'|,(\s*[\]}])'                                 # 3: vírgula final antes de ] ou }
+    r'|(?<![\w$])([A-Za-z_$][\w$]*)(\s*:)'          # 4, 5: chave sem aspas
+)
+_SINGLE_QUOTED_ESCAPE_RE = re.compile(r'\\[\s\S]|"')
+_CATEGORIES_RE = re.compile(rb'categories\s*:\s*\{')
+_YT_CONST_RE = re.compile(rb'const\s+youtubeMaydayVideos\s*=\s*\{')
+_FIRST_OBJ_ARR_RE = re.compile(rb'\[\s*\{\s*"')
+
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+_JSON_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+def dumps_json(obj, pretty=True):
+    """
+    Serializa obj sem escapar não-ASCII: com indentação de 2 espaços, ou compacto
+    (sem espaços) com pretty=False.
+    Usa orjson (bem mais rápido) quando instalado. Para strings, bools, null e inteiros
+    (o conteúdo do catálogo) a saída é igual à do json.dumps; floats podem sair escritos
+    de outro jeito (1e16 em vez de 1e+16) e NaN/Infinity viram null. Inteiros acima de
+    64 bits, que o orjson recusa, são serializados pelo json da stdlib.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    return (_JSON_ENCODER if pretty else _JSON_COMPACT_ENCODER).encode(obj)
+
+def _string_end(s, start):
+    """
+    Índice da aspa que fecha a string aberta em s[start], ou -1 se ela não fecha.
+    Salta de aspa em aspa com find(); uma aspa precedida de número ímpar de '\\' está escapada.
+    """
+    quote = s[start:start+1]
+    j = start
+    while True:
+        j = s.find(quote, j + 1)
+        if j == -1:
+            return -1
+        k = j - 1
+        while k > start and s[k] == _BACKSLASH:
+            k -= 1
+        if (j - 1 - k) % 2 == 0:
+            return j
+
 def find_matching_bracket(s, start_index):
+    """
+    Índice do colchete/chave que fecha o aberto em s[start_index].
+    s é bytes (ou mmap); cada byte é classificado por tabela, sem criar objetos.
+    """
     opening = s[start_index]
-    if opening not in '[{':
+    if _BYTE_CLASS[opening] != _OPEN_BYTE:
         raise ValueError("start_index must point to '[' or '{'")
-    stack = [opening]
-    i = start_index + 1
-    in_string = False
-    string_char = None
-    escape = False
-    while i < len(s):
+    # a pilha guarda o byte de fechamento esperado
+    stack = [_CLOSER[opening]]
+    byte_class = _BYTE_CLASS
+    search = _BRACKET_SCAN_RE.search
+    pos = start_index + 1
+    # visita só as posições relevantes; o resto do texto (e o miolo das strings) é pulado
+    while True:
+        m = search(s, pos)
+        if m is None:
+            break
+        i = m.start()
         ch = s[i]
-        if escape:
-            escape = False
-        elif ch == '\\':
-            escape = True
-        elif in_string:
-            if ch == string_char:
-                in_string = False
-                string_char = None
-        elif ch == '"' or ch == "'":
-            in_string = True
-            string_char = ch
-        elif ch == '[' or ch == '{':
-            stack.append(ch)
-        elif ch == ']' or ch == '}':
-            if not stack:
-                raise ValueError("Unbalanced brackets")
-            top = stack.pop()
-            if (top == '[' and ch != ']') or (top == '{' and ch != '}'):
+        c = byte_class[ch]
+        if c == _BACKSLASH_BYTE:
+            pos = i + 2
+        elif c == _QUOTE_BYTE:
+            end = _string_end(s, i)
+            if end == -1:
+                break
+            pos = end + 1
+        elif c == _OPEN_BYTE:
+            stack.append(_CLOSER[ch])
+            pos = i + 1
+        else:
+            if stack.pop() != ch:
                 raise ValueError("Mismatched brackets")
             if not stack:
                 return i
-        i += 1
+            pos = i + 1
     raise ValueError("No matching bracket found")
 
 def remove_js_comments(source):
     """
     Remove comentários JS (// ... e /* ... */) mas preserva // que estão dentro de strings.
-    Implementação por varredura estado-ful: acompanha strings e escapes.
+    A varredura fica toda no motor de regex (em C): cada trecho entre comentários é copiado
+    de uma vez (não string a string) e cada comentário é trocado por '' numa passada de sub().
     """
-    result_chars = []
-    i = 0
-    n = len(source)
-    in_string = False
-    string_char = None
-    escape = False
-    while i < n:
-        ch = source[i]
-        if escape:
-            result_chars.append(ch)
-            escape = False
-            i += 1
-            continue
-        if in_string:
-            if ch == '\\':
-                result_chars.append(ch)
-                escape = True
-                i += 1
-                continue
-            if ch == string_char:
-                result_chars.append(ch)
-                in_string = False
-                string_char = None
-                i += 1
-                continue
-            result_chars.append(ch)
-            i += 1
-            continue
-        else:
-            # não está em string
-            if ch == '"' or ch == "'":
-                in_string = True
-                string_char = ch
-                result_chars.append(ch)
-                i += 1
-                continue
-            # detectar comentário de linha //
-            if ch == '/' and i+1 < n and source[i+1] == '/':
-                i += 2
-                # pular até quebra de linha (preservando a quebra)
-                while i < n and source[i] not in '\r\n':
-                    i += 1
-                continue
-            # detectar comentário de bloco /* ... */
-            if ch == '/' and i+1 < n and source[i+1] == '*':
-                i += 2
-                while i+1 < n and not (source[i] == '*' and source[i+1] == '/'):
-                    i += 1
-                i += 2 if i+1 < n else 0
-                continue
-            # caractere normal
-            result_chars.append(ch)
-            i += 1
-    return ''.join(result_chars)
+    return _JS_STRING_OR_COMMENT_RE.sub(r'\1', source)
+
+def _single_quoted_escape_to_json(m):
+    # \' vira ' e " solto passa a precisar de escape; os demais escapes valem igual em JSON
+    esc = m.group()
+    if esc == '"':
+        return '\\"'
+    return "'" if esc == "\\'" else esc
+
+def _single_quoted_to_json(m):
+    return '"' + _SINGLE_QUOTED_ESCAPE_RE.sub(_single_quoted_escape_to_json, m.group(2)) + '"'
+
+def _unquoted_key_to_json(m):
+    return f'"{m.group(4)}"{m.group(5)}'
+
+# último grupo casado -> conversão do token
+_JS_TOKEN_HANDLERS = {
+    1: operator.itemgetter(1),
+    2: _single_quoted_to_json,
+    3: operator.itemgetter(3),
+    5: _unquoted_key_to_json,
+}
+
+def _js_token_to_json(m):
+    return _JS_TOKEN_HANDLERS[m.lastindex](m)
 
 def clean_js_array_to_json_array(array_str):
     # remover comentários (respeitando strings)
     no_comments = remove_js_comments(array_str)
-    # remover vírgulas finais antes de ] ou }
-    no_trailing = re.sub(r',\s*(\]|\})', r'\1', no_comments)
-    return no_trailing
+    # vírgulas finais, aspas simples e chaves sem aspas, numa passada que respeita strings
+    return _JS_LITERAL_TOKEN_RE.sub(_js_token_to_json, no_comments)
+
+def _loads_json_array(text):
+    """
+    Decodifica JSON estrito com orjson quando instalado, senão com json.loads.
+    Diferença conhecida: o orjson lê inteiros acima de 64 bits como float, sem erro.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson é mais estrito (NaN, Infinity, surrogates soltos...): o json da stdlib aceita
+            pass
+    return json.loads(text)
 
 def parse_js_array(array_str):
+    # caminho rápido: o array já é JSON estrito (caso dos arquivos gerados pelos scrapers)
+    try:
+        return _loads_json_array(array_str)
+    except ValueError:
+        pass
     cleaned = clean_js_array_to_json_array(array_str)
     try:
-        return json.loads(cleaned)
-    except Exception as e:
-        # Tentativas de fallback:
-        # 1) converter aspas simples em duplas (valores simples)
-        alt = re.sub(r"(?<=[:\s])'([^']*)'(?=[,\]\}])", r'"\1"', cleaned)
-        try:
-            return json.loads(alt)
-        except Exception:
-            # 2) colocar aspas em chaves não citadas (heurística simples)
-            def quote_keys(s):
-                def repl(match):
-                    return '"' + match.group(1) + '":'
-                return re.sub(r'(\b[a-zA-Z_][a-zA-Z0-9_]*)\s*:', repl, s)
-            try:
-                alt2 = quote_keys(alt)
-                return json.loads(alt2)
-            except Exception as e2:
-                raise RuntimeError(f"Failed to parse JSON array: {e2}") from e2
+        return _loads_json_array(cleaned)
+    except ValueError as e:
+        raise RuntimeError(f"Failed to parse JSON array: {e}") from e
+
+@functools.lru_cache(maxsize=32)
+def _array_key_pattern(key):
+    # key: [   ou   "key": [   /   'key': [   numa única alternativa; a chave não pode ser
+    # só o final de outro nome (related_videos) e a aspa de fechamento repete a de abertura
+    return re.compile(rb'(?<![\w$])(["\']?)' + re.escape(key.encode('utf-8')) + rb'\1\s*:\s*\[')
 
 def extract_array_by_key(js_text, key):
     """
-    Extrai a string do array [...] associado a key: [
-    Retorna string incluindo colchetes.
+    Extrai o array [...] associado a key: [ de js_text (bytes ou mmap).
+    Retorna bytes incluindo colchetes.
     """
-    patterns = [rf'{re.escape(key)}\s*:\s*\[', rf'["\']{re.escape(key)}["\']\s*:\s*\[']
-    for pat in patterns:
-        m = re.search(pat, js_text)
-        if m:
-            start_bracket = js_text.find('[', m.end()-1)
-            if start_bracket == -1:
-                continue
-            try:
-                end_bracket = find_matching_bracket(js_text, start_bracket)
-                return js_text[start_bracket:end_bracket+1]
-            except Exception:
-                continue
+    for m in _array_key_pattern(key).finditer(js_text):
+        start_bracket = m.end() - 1
+        try:
+            end_bracket = find_matching_bracket(js_text, start_bracket)
+            return js_text[start_bracket:end_bracket+1]
+        except Exception:
+            continue
     return None
 
+@contextlib.contextmanager
+def _mapped_file(path):
+    """
+    Mapeia o arquivo em memória (somente leitura) e entrega o conteúdo como bytes.
+    As varreduras rodam direto nos bytes; só o array extraído é decodificado.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:  # mmap não aceita arquivo vazio
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
 def load_dailymotion_items(path):
-    text = open(path, 'r', encoding='utf-8').read()
-    # tentar primeira abordagem: maydayEpisodes
-    arr = extract_array_by_key(text, 'maydayEpisodes')
-    if not arr:
-        # procurar categories {... maydayEpisodes: [...] }
-        m = re.search(r'categories\s*:\s*\{', text)
-        if m:
-            start = text.find('{', m.end()-1)
-            try:
+    with _mapped_file(path) as text:
+        # tentar primeira abordagem: maydayEpisodes
+        arr = extract_array_by_key(text, 'maydayEpisodes')
+        if not arr:
+            # procurar categories {... maydayEpisodes: [...] }
+            m = _CATEGORIES_RE.search(text)
+            if m:
+                start = text.find(b'{', m.end()-1)
+                try:
+                    end = find_matching_bracket(text, start)
+                    block = text[start:end+1]
+                    arr = extract_array_by_key(block, 'maydayEpisodes')
+                except Exception:
+                    arr = None
+        if not arr:
+            # fallback: pegar o primeiro grande array de objetos
+            m = _FIRST_OBJ_ARR_RE.search(text)
+            if m:
+                start = m.start()
                 end = find_matching_bracket(text, start)
-                block = text[start:end+1]
-                arr = extract_array_by_key(block, 'maydayEpisodes')
-            except Exception:
-                arr = None
-    if not arr:
-        # fallback: pegar o primeiro grande array de objetos
-        m = re.search(r'\[\s*\{\s*"', text)
-        if m:
-            start = m.start()
-            end = find_matching_bracket(text, start)
-            arr = text[start:end+1]
+                arr = text[start:end+1]
     if not arr:
         raise RuntimeError("Não consegui localizar o array de vídeos no dailymotion_videos.js")
-    items = parse_js_array(arr)
+    items = parse_js_array(arr.decode('utf-8'))
     return items
 
 def load_youtube_items(path):
-    text = open(path, 'r', encoding='utf-8').read()
-    # buscar vídeos dentro do objeto youtubeMaydayVideos
-    arr = extract_array_by_key(text, 'videos')
-    if not arr:
-        # buscar o bloco do const youtubeMaydayVideos = { ... } e extrair 'videos' dentro dele
-        m = re.search(r'const\s+youtubeMaydayVideos\s*=\s*\{', text)
-        if m:
-            start = text.find('{', m.end()-1)
-            try:
-                end = find_matching_bracket(text, start)
-                block = text[start:end+1]
-                arr = extract_array_by_key(block, 'videos')
-            except Exception:
-                arr = None
+    with _mapped_file(path) as text:
+        # buscar vídeos dentro do objeto youtubeMaydayVideos
+        arr = extract_array_by_key(text, 'videos')
+        if not arr:
+            # buscar o bloco do const youtubeMaydayVideos = { ... } e extrair 'videos' dentro dele
+            m = _YT_CONST_RE.search(text)
+            if m:
+                start = text.find(b'{', m.end()-1)
+                try:
+                    end = find_matching_bracket(text, start)
+                    block = text[start:end+1]
+                    arr = extract_array_by_key(block, 'videos')
+                except Exception:
+                    arr = None
     if not arr:
         raise RuntimeError("Não consegui localizar o array 'videos' no youtube_videos.js")
-    items = parse_js_array(arr)
+    items = parse_js_array(arr.decode('utf-8'))
     return items
 
+CACHE_DIR = '.cache'
+_CACHE_VERSION = 1  # incrementar quando o formato do que os loaders devolvem mudar (ex.: CATALOG_FIELDS)
+
+def _cache_entry(loader, path, cache_dir=CACHE_DIR):
+    """Devolve (caminho do arquivo de cache, chave de validade) de loader(path)."""
+    st = os.stat(path)
+    source = f"{loader.__name__}|{os.path.abspath(path)}"
+    key = (_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+    return os.path.join(cache_dir, hashlib.sha1(source.encode('utf-8')).hexdigest() + '.pkl'), key
+
+def _read_cache(cache_path, key):
+    """Devolve o resultado salvo em cache_path se ainda valer para key; senão None (cache ilegível conta como ausente)."""
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, items = pickle.load(f)
+    except Exception:
+        return None
+    return items if cached_key == key else None
+
+def _write_cache(cache_path, key, items):
+    """Grava o resultado em cache_path; falha ao gravar não interrompe nada."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, items), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+# abaixo disso parsear tudo em sequência é mais rápido que subir os processos
+# (os arquivos atuais, ~400 KB juntos, levam ~20 ms; só o pool custa ~40 ms)
+_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+def load_all_rows(jobs, use_cache=True, cache_dir=CACHE_DIR):
+    """
+    Executa cada (loader, path) de jobs e devolve os resultados na mesma ordem.
+    O cache é consultado aqui mesmo, no processo principal: só o que não estiver em cache
+    é parseado, e o resultado é gravado no cache ao voltar. Os arquivos só são parseados
+    em processos separados quando há mais de um e, juntos, passam de _PARALLEL_MIN_BYTES;
+    com tudo em cache nenhum processo é criado.
+    """
+    results = [None] * len(jobs)
+    entries = [None] * len(jobs)
+    if use_cache:
+        for i, (loader, path) in enumerate(jobs):
+            entries[i] = _cache_entry(loader, path, cache_dir)
+            results[i] = _read_cache(*entries[i])
+    misses = [i for i, items in enumerate(results) if items is None]
+    if len(misses) > 1 and sum(os.path.getsize(jobs[i][1]) for i in misses) >= _PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=len(misses)) as ex:
+            futures = {i: ex.submit(jobs[i][0], jobs[i][1]) for i in misses}
+            for i, future in futures.items():
+                results[i] = future.result()
+    else:
+        for i in misses:
+            results[i] = jobs[i][0](jobs[i][1])
+    if use_cache:
+        for i in misses:
+            _write_cache(*entries[i], results[i])
+    return results
+
+# Ordem dos campos de cada vídeo no catálogo unificado
+CATALOG_FIELDS = (
+    "url", "text", "title", "videoId", "imageUrl", "duration",
+    "views", "is_external", "season", "episode", "hasLocalImage",
+)
+
+def _youtube_values(yt_item):
+    """Valores de um vídeo do YouTube, na ordem de CATALOG_FIELDS."""
+    g = yt_item.get
+    video_id = g("id")
+    url = g("url") or (f"https://www.youtube.com/watch?v={video_id}" if video_id else None)
+    title = g("title") or g("text") or ""
+    return (
+        url,
+        title,
+        title,
+        video_id or "",
+        g("thumbnail") or g("imageUrl") or "",
+        g("duration") or "N/A",
+        g("views") or "N/A",
+        False,
+        g("season"),
+        g("episode"),
+        False,
+    )
+
+def _dailymotion_values(dm_item):
+    """Valores de um vídeo do Dailymotion, na ordem de CATALOG_FIELDS."""
+    g = dm_item.get
+    return (
+        g("url"),
+        g("text") or g("title") or "",
+        g("title") or g("text") or "",
+        g("videoId") or g("video_id") or "",
+        g("imageUrl") or g("image") or g("thumbnail") or "",
+        g("duration") or "N/A",
+        g("views") or "N/A",
+        g("is_external", False),
+        g("season"),
+        g("episode"),
+        g("hasLocalImage", False),
+    )
+
+# Registro vazio já com todas as chaves na ordem final: copy() clona a tabela de hash
+# pronta e update() só troca os valores, sem redimensionar o dict
+_EMPTY_RECORD = dict.fromkeys(CATALOG_FIELDS)
+
+def _record_from_row(row):
+    record = _EMPTY_RECORD.copy()
+    record.update(zip(CATALOG_FIELDS, row))
+    return record
+
 def convert_youtube_to_dailymotion_format(yt_item):
-    url = yt_item.get('url') or (f"https://www.youtube.com/watch?v={yt_item.get('id')}" if yt_item.get('id') else None)
-    return {
-        "url": url,
-        "text": yt_item.get("title") or yt_item.get("text") or "",
-        "title": yt_item.get("title") or yt_item.get("text") or "",
-        "videoId": yt_item.get("id") or "",
-        "imageUrl": yt_item.get("thumbnail") or yt_item.get("imageUrl") or "",
-        "duration": yt_item.get("duration") or "N/A",
-        "views": yt_item.get("views") or "N/A",
-        "is_external": False,
-        "season": yt_item.get("season"),
-        "episode": yt_item.get("episode"),
-        "hasLocalImage": False
-    }
+    return _record_from_row(_youtube_values(yt_item))
 
 def normalize_dailymotion_item(dm_item):
-    return {
-        "url": dm_item.get("url"),
-        "text": dm_item.get("text") or dm_item.get("title") or "",
-        "title": dm_item.get("title") or dm_item.get("text") or "",
-        "videoId": dm_item.get("videoId") or dm_item.get("video_id") or "",
-        "imageUrl": dm_item.get("imageUrl") or dm_item.get("image") or dm_item.get("thumbnail") or "",
-        "duration": dm_item.get("duration") or "N/A",
-        "views": dm_item.get("views") or "N/A",
-        "is_external": dm_item.get("is_external", False),
-        "season": dm_item.get("season"),
-        "episode": dm_item.get("episode"),
-        "hasLocalImage": dm_item.get("hasLocalImage", False)
-    }
+    return _record_from_row(_dailymotion_values(dm_item))
+
+# Loaders que já devolvem os vídeos normalizados: uma tupla por vídeo, na ordem de
+# CATALOG_FIELDS. É isso que vai para o cache, então uma execução em que só um dos
+# arquivos mudou não parseia nem normaliza o outro de novo.
+def load_dailymotion_rows(path):
+    return [_dailymotion_values(dm) for dm in load_dailymotion_items(path)]
+
+def load_youtube_rows(path):
+    return [_youtube_values(yt) for yt in load_youtube_items(path)]
+
+_JS_FOOTER = (
+    ";\n\n"
+    "if (typeof module !== 'undefined' && module.exports) {\n"
+    "  module.exports = catalogoVideos;\n"
+    "} else if (typeof window !== 'undefined') {\n"
+    "  window.catalogoVideos = catalogoVideos;\n"
+    "}\n"
+)
+
+def generate_catalog(dm_items, yt_items, out_path="catalogo_videos.js", pretty=False):
+    """
+    Gera o catálogo unificado em out_path a partir dos itens crus de cada fonte.
+    O JSON sai compacto (é lido pelo navegador, não por gente); pretty=True indenta com 2 espaços.
+    """
+    episodes = [normalize_dailymotion_item(dm) for dm in dm_items]
+    episodes.extend(convert_youtube_to_dailymotion_format(yt) for yt in yt_items)
+    return _write_catalog(out_path, episodes, pretty)
 
-def generate_catalog(dm_items, yt_items, out_path="catalogo_videos.js"):
-    combined = []
-    for dm in dm_items:
-        combined.append(normalize_dailymotion_item(dm))
-    for yt in yt_items:
-        combined.append(convert_youtube_to_dailymotion_format(yt))
-    total = len(combined)
+def generate_catalog_from_rows(rows, out_path="catalogo_videos.js", pretty=False):
+    """
+    Gera o catálogo a partir de vídeos já normalizados (tuplas na ordem de CATALOG_FIELDS,
+    como as de load_dailymotion_rows/load_youtube_rows).
+    """
+    return _write_catalog(out_path, [_record_from_row(row) for row in rows], pretty)
+
+def _write_catalog(out_path, episodes, pretty):
+    total = len(episodes)
+    # um único instante para os metadados e para o comentário do cabeçalho
+    now = datetime.now()
     catalog = {
         "metadata": {
-            "generated": datetime.now().isoformat(),
+            "generated": now.isoformat(),
             "source": "dailymotion + youtube",
             "totalVideos": total
         },
         "statistics": {"total_videos": total},
-        "categories": {"maydayEpisodes": combined}
+        "categories": {"maydayEpisodes": episodes}
     }
-    js_text = (
-        f"// Arquivo gerado automaticamente em {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n"
+    # escreve num arquivo temporário e só troca pelo definitivo no fim: um erro no meio
+    # não deixa o catalogo_videos.js (servido pelo site) pela metade
+    tmp_path = out_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            _write_catalog_js(f, catalog, now, pretty)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return out_path, total
+
+def _write_catalog_js(f, catalog, now, pretty):
+    f.write(
+        f"// Arquivo gerado automaticamente em {now.strftime('%d/%m/%Y %H:%M:%S')}\n"
         f"// Catalogo unificado (Dailymotion + YouTube)\n\n"
-        f"const catalogoVideos = {json.dumps(catalog, indent=2, ensure_ascii=False)};\n\n"
-        "if (typeof module !== 'undefined' && module.exports) {\n"
-        "  module.exports = catalogoVideos;\n"
-        "} else if (typeof window !== 'undefined') {\n"
-        "  window.catalogoVideos = catalogoVideos;\n"
-        "}\n"
+        "const catalogoVideos = "
     )
-    with open(out_path, 'w', encoding='utf-8') as f:
-        f.write(js_text)
-    return out_path, total
+    # o catálogo inteiro numa chamada só: com orjson é o caminho mais rápido,
+    # e sem ele o json.dump já escreve no arquivo enquanto serializa
+    if orjson is not None:
+        f.write(dumps_json(catalog, pretty))
+    elif pretty:
+        json.dump(catalog, f, indent=2, ensure_ascii=False)
+    else:
+        json.dump(catalog, f, separators=(',', ':'), ensure_ascii=False)
+    f.write(_JS_FOOTER)
 
 def main():
     parser = argparse.ArgumentParser(description="Unifica dailymotion_videos.js + youtube_videos.js em catalogo_videos.js")
     parser.add_argument('-d', '--dailymotion', default='dailymotion_videos.js', help='Caminho para dailymotion_videos.js')
     parser.add_argument('-y', '--youtube', default='youtube_videos.js', help='Caminho para youtube_videos.js')
     parser.add_argument('-o', '--output', default='catalogo_videos.js', help='Caminho do output (catalogo_videos.js)')
+    parser.add_argument('--pretty', action='store_true', help='Gera o JSON indentado (mais legível, arquivo maior)')
+    parser.add_argument('--no-cache', action='store_true', help=f'Ignora o cache de arquivos já parseados ({CACHE_DIR}/)')
     args = parser.parse_args()
 
     try:
@@ -274,16 +498,18 @@ def main():
             print("Erro: verifique se os arquivos existem no diretório ou passe caminhos com -d e -y")
             sys.exit(1)
 
-        print("🔎 Carregando Dailymotion...")
-        dm_items = load_dailymotion_items(args.dailymotion)
-        print(f"  ➜ Encontrados {len(dm_items)} itens no Dailymotion.")
-
-        print("🔎 Carregando YouTube...")
-        yt_items = load_youtube_items(args.youtube)
-        print(f"  ➜ Encontrados {len(yt_items)} itens no YouTube.")
+        print("🔎 Carregando Dailymotion e YouTube...")
+        dm_rows, yt_rows = load_all_rows(
+            [(load_dailymotion_rows, args.dailymotion), (load_youtube_rows, args.youtube)],
+            use_cache=not args.no_cache,
+        )
+        print(f"  ➜ Encontrados {len(dm_rows)} itens no Dailymotion.")
+        print(f"  ➜ Encontrados {len(yt_rows)} itens no YouTube.")
 
         print("🔁 Gerando catálogo unificado...")
-        out_path, total = generate_catalog(dm_items, yt_items, out_path=args.output)
+        out_path, total = generate_catalog_from_rows(
+            itertools.chain(dm_rows, yt_rows), out_path=args.output, pretty=args.pretty,
+        )
         print(f"✅ Gerado {out_path} com {total} vídeos.")
 
     except Exception: